@@ -5,7 +5,7 @@ This module provides the core AI capabilities for the sales assistant platform.
 It handles personalized email generation, response analysis, lead scoring,
 and machine learning algorithms for optimizing sales processes.
 
-Dependencies: numpy, pandas, sklearn, config.py, integrations.py, database.py
+Dependencies: numpy, pandas, sklearn, streamlit (session settings), config.py, integrations.py, database.py
 Used by: automation.py, app.py
 """
 
@@ -26,6 +26,7 @@ from sklearn.preprocessing import StandardScaler
 import pickle
 import os
 import hashlib
+import streamlit as st
 
 from config import config
 from integrations import integration_manager, LeadData, AIResponse
@@ -33,6 +34,11 @@ from database import db_manager, Lead, Email
 
 logger = logging.getLogger(__name__)
 
+# Estimated output tokens per email in a batched cold email response (subject, 150-word body, JSON fields)
+COLD_EMAIL_OUTPUT_TOKENS = 300
+# Maximum concurrent per-lead Gemini requests when a batched request falls back
+COLD_EMAIL_FALLBACK_CONCURRENCY = 5
+
 @dataclass
 class LeadScore:
     """Lead scoring result."""
@@ -643,9 +649,6 @@ class EmailPersonalizationEngine:
     
     async def _check_rate_limits(self):
         """Check and enforce rate limits to optimize API usage."""
-        import time
-        import asyncio
-        
         current_time = time.time()
         
         # Check daily limit
@@ -919,6 +922,69 @@ class AIEngine:
                 error_message=f"Cold email generation failed: {str(e)}"
             )
     
+    async def generate_cold_emails_batch(self, leads: List[LeadData], user_settings: Dict[str, Any]) -> List[AIResponse]:
+        """
+        Generate personalized cold emails for several leads, batching as many per Gemini request
+        as fit in the output token budget.
+        
+        Args:
+            leads: Leads to write to, in order
+            user_settings: User's sales approach, value proposition, calendly link
+            
+        Returns:
+            One AIResponse per lead, in the same order as ``leads``
+        """
+        if not leads:
+            return []
+        
+        # Larger batches would be truncated at max_output_tokens and fail to parse
+        emails_per_request = max(1, self.gemini_api.max_tokens // COLD_EMAIL_OUTPUT_TOKENS)
+        fallback_semaphore = asyncio.Semaphore(COLD_EMAIL_FALLBACK_CONCURRENCY)
+        
+        chunk_results = await asyncio.gather(
+            *(self._generate_cold_email_chunk(leads[start:start + emails_per_request], user_settings, fallback_semaphore)
+              for start in range(0, len(leads), emails_per_request))
+        )
+        return [response for chunk in chunk_results for response in chunk]
+    
+    async def _generate_cold_email_chunk(self, leads: List[LeadData], user_settings: Dict[str, Any],
+                                         fallback_semaphore: asyncio.Semaphore) -> List[AIResponse]:
+        """Generate cold emails for one chunk of leads in a single request, falling back to one request per lead."""
+        try:
+            prompt = self._create_cold_email_batch_prompt(leads, user_settings)
+            response = await self.gemini_api.generate_content(prompt)
+            
+            if response.success:
+                parsed_emails = self._parse_email_batch_response(response.content, len(leads))
+                if parsed_emails is not None:
+                    logger.info(f"Generated {len(leads)} cold emails in one batch request")
+                    return [
+                        AIResponse(
+                            success=True,
+                            content=parsed['email_body'],
+                            metadata={
+                                'subject_line': parsed.get('subject_line'),
+                                'personalization_score': parsed.get('personalization_score'),
+                                'pain_points_addressed': parsed.get('pain_points_addressed', []),
+                                'calendly_integration': parsed.get('calendly_integration')
+                            }
+                        )
+                        for parsed in parsed_emails
+                    ]
+                logger.warning("Batch cold email response was malformed, generating emails individually")
+            else:
+                logger.error(f"Batch cold email generation failed: {response.error_message}")
+                
+        except Exception as e:
+            logger.error(f"Batch cold email generation failed: {e}")
+        
+        # Fall back to one request per lead, bounded so a failed campaign batch doesn't burst the API
+        async def generate_single(lead_data: LeadData) -> AIResponse:
+            async with fallback_semaphore:
+                return await self.generate_cold_email(lead_data, user_settings)
+        
+        return list(await asyncio.gather(*(generate_single(lead_data) for lead_data in leads)))
+    
     async def classify_response(self, email_content: str) -> AIResponse:
         """
         Analyze reply sentiment and intent for automated follow-up decisions.
@@ -1158,6 +1224,53 @@ class AIEngine:
         Remember: This email should feel like it was written specifically for {lead_data.name} at {lead_data.company}, not a mass email.
         """
     
+    def _create_cold_email_batch_prompt(self, leads: List[LeadData], user_settings: Dict[str, Any]) -> str:
+        """Create one prompt asking for a cold email per lead as a JSON array."""
+        leads_json = json.dumps([
+            {
+                'name': lead_data.name,
+                'job_title': lead_data.job_title,
+                'company': lead_data.company,
+                'company_description': lead_data.company_description or 'Not provided',
+                'pain_points': lead_data.pain_points or []
+            }
+            for lead_data in leads
+        ], indent=2)
+        
+        return f"""
+        You are an expert sales professional writing personalized cold emails. Write one completely unique, compelling email for EACH of the {len(leads)} leads below.
+
+        LEADS (JSON array):
+        {leads_json}
+
+        USER SETTINGS:
+        - Value Proposition: {user_settings.get('value_proposition', 'To be customized')}
+        - Calendly Link: {user_settings.get('calendly_link', 'To be included')}
+        - Sales Approach: {user_settings.get('sales_approach', 'Professional and consultative')}
+        - User Name: {user_settings.get('user_name', 'Your Name')}
+
+        REQUIREMENTS FOR EVERY EMAIL:
+        1. Create a compelling subject line (max 60 characters)
+        2. Write a personalized email body (max 150 words)
+        3. Infer the lead's seniority and likely pain points from their role and company
+        4. Include the Calendly link naturally in the flow
+        5. End with a clear, specific call-to-action
+        6. Use the lead's name naturally and reference their company and role specifically
+        7. Avoid generic templates - no two emails should read alike
+        8. Use the actual user name "{user_settings.get('user_name', 'Your Name')}" in the signature, NOT [Your Name]
+
+        FORMAT YOUR RESPONSE AS A JSON ARRAY WITH EXACTLY {len(leads)} OBJECTS, IN THE SAME ORDER AS THE LEADS:
+        [
+            {{
+                "subject_line": "Your compelling subject line",
+                "email_body": "Your personalized email content",
+                "personalization_score": 0.95,
+                "pain_points_addressed": ["pain point 1", "pain point 2"],
+                "calendly_integration": "How the calendly link was integrated"
+            }}
+        ]
+        """
+    
     def _create_response_classification_prompt(self, email_content: str) -> str:
         """Create prompt for email response classification."""
         return f"""
@@ -1308,6 +1421,20 @@ class AIEngine:
                 'calendly_integration': 'Standard integration'
             }
     
+    def _parse_email_batch_response(self, content: str, expected_count: int) -> Optional[List[Dict[str, Any]]]:
+        """Parse a batch email response; returns None unless it is a JSON array of the expected length."""
+        try:
+            # Tolerate a markdown code fence around the JSON
+            match = re.search(r'\[.*\]', content, re.DOTALL)
+            emails = json.loads(match.group(0) if match else content)
+            if (isinstance(emails, list) and len(emails) == expected_count
+                    and all(isinstance(item, dict) and item.get('email_body') for item in emails)):
+                return emails
+            return None
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.error(f"Failed to parse batch email response: {e}")
+            return None
+    
     def _parse_classification_response(self, content: str) -> Dict[str, Any]:
         """Parse AI-generated classification response."""
         try:
@@ -1464,8 +1591,6 @@ class AIEngine:
             # Get user's Calendly link from session state (passed from app.py)
             user_calendly = None
             try:
-                # Import streamlit to access session state
-                import streamlit as st
                 user_calendly = st.session_state.get('calendly_link')
             except:
                 pass
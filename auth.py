@@ -9,13 +9,15 @@ Dependencies: streamlit, google_auth_oauthlib, google.auth, config.py, database.
 Used by: app.py, integrations.py, database.py
 """
 
+import asyncio
 import logging
 import json
 import time
 import os
-from typing import Dict, Optional, Any, Tuple
+from typing import Dict, FrozenSet, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+from functools import cached_property
 import streamlit as st
 from google_auth_oauthlib.flow import Flow
 from google.auth.transport.requests import Request
@@ -32,6 +34,12 @@ from database import db_manager, User
 
 logger = logging.getLogger(__name__)
 
+# Scopes that grant read access to Google Sheets
+SHEETS_SCOPES = frozenset({
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/spreadsheets.readonly'
+})
+
 @dataclass
 class OAuthTokens:
     """OAuth token data structure."""
@@ -42,6 +50,11 @@ class OAuthTokens:
     client_secret: str
     scopes: list
     expiry: datetime
+    
+    @cached_property
+    def scope_set(self) -> FrozenSet[str]:
+        """Granted scopes as a frozenset, built once for O(1) membership checks."""
+        return frozenset(self.scopes or ())
 
 class AuthManager:
     """Manages authentication and authorization for the platform."""
@@ -491,7 +504,6 @@ def get_current_user() -> Optional[User]:
     """Get current authenticated user object."""
     user_id = auth_manager.get_current_user_id()
     if user_id:
-        import asyncio
         try:
             loop = asyncio.get_event_loop()
             if loop.is_running():
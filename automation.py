@@ -19,7 +19,7 @@ import json
 
 from config import config
 from ai_engine import ai_engine
-from integrations import integration_manager
+from integrations import integration_manager, LeadData
 from database import db_manager, Lead, Campaign, Email
 
 logger = logging.getLogger(__name__)
@@ -330,8 +330,6 @@ class CampaignOrchestrator:
     
     def _convert_lead_to_lead_data(self, lead: Lead):
         """Convert database Lead to LeadData format."""
-        from integrations import LeadData
-        
         return LeadData(
             name=lead.name,
             email=lead.email,
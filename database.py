@@ -12,9 +12,10 @@ Used by: integrations.py, ai_engine.py, automation.py, app.py
 import logging
 import json
 import time
+import uuid
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from google.cloud import firestore
 from google.cloud.firestore import DocumentReference, CollectionReference
 import firebase_admin
@@ -25,6 +26,9 @@ from config import config
 
 logger = logging.getLogger(__name__)
 
+# Lead pipeline statuses, in pipeline order
+LEAD_STATUSES = ("new", "contacted", "responded", "qualified", "booked", "lost")
+
 @dataclass
 class User:
     """User data model."""
@@ -56,17 +60,18 @@ class Lead:
     phone: Optional[str] = None
     linkedin_url: Optional[str] = None
     company_description: Optional[str] = None
-    pain_points: List[str] = None
+    pain_points: List[str] = field(default_factory=list)
     lead_score: float = 0.0
-    status: str = "new"  # new, contacted, responded, qualified, booked, lost
+    status: str = "new"  # one of LEAD_STATUSES
     created_at: datetime = None
     last_contacted: Optional[datetime] = None
     campaign_id: Optional[str] = None
-    engagement_metrics: Dict[str, Any] = None
+    engagement_metrics: Dict[str, Any] = field(default_factory=dict)
     
     def __post_init__(self):
         if self.created_at is None:
             self.created_at = datetime.utcnow()
+        # Stored documents may carry explicit nulls for these fields
         if self.pain_points is None:
             self.pain_points = []
         if self.engagement_metrics is None:
@@ -158,9 +163,9 @@ class DatabaseManager:
     
     def _validate_document(self, data: Dict[str, Any], required_fields: List[str]) -> bool:
         """Validate document data against required fields."""
-        for field in required_fields:
-            if field not in data or data[field] is None:
-                logger.warning(f"Missing required field: {field}")
+        for field_name in required_fields:
+            if field_name not in data or data[field_name] is None:
+                logger.warning(f"Missing required field: {field_name}")
                 return False
         return True
     
@@ -284,6 +289,23 @@ class DatabaseManager:
             logger.error(f"Failed to get leads for user {user_id}: {e}")
             raise
     
+    async def get_lead_status_counts(self, user_id: str) -> Dict[str, int]:
+        """Count a user's leads per status with server-side count aggregations."""
+        try:
+            user_leads = self._get_collection('leads').where('user_id', '==', user_id)
+            
+            counts = {}
+            for status in LEAD_STATUSES:
+                result = user_leads.where('status', '==', status).count().get()
+                counts[status] = int(result[0][0].value)
+            
+            logger.info(f"Retrieved lead status counts for user {user_id}: {counts}")
+            return counts
+            
+        except Exception as e:
+            logger.error(f"Failed to get lead status counts for user {user_id}: {e}")
+            raise
+    
     async def update_lead_status(self, lead_id: str, status: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
         """Update lead status and metadata."""
         try:
@@ -340,27 +362,26 @@ class DatabaseManager:
             raise
     
     async def bulk_create_leads(self, leads_data: List[Dict[str, Any]]) -> List[str]:
-        """Create multiple leads in batch."""
+        """Create multiple leads in batched writes."""
         try:
-            if len(leads_data) > self.batch_size:
-                raise ValueError(f"Batch size {len(leads_data)} exceeds limit {self.batch_size}")
-            
-            batch = self.db.batch()
             lead_ids = []
+            created_at = datetime.utcnow()
+            
+            for start in range(0, len(leads_data), self.batch_size):
+                batch = self.db.batch()
+                for lead_data in leads_data[start:start + self.batch_size]:
+                    lead_id = f"lead_{uuid.uuid4().hex}"
+                    lead_data['lead_id'] = lead_id
+                    lead_data['created_at'] = created_at
+                    lead_data['status'] = 'new'
+                    lead_data['lead_score'] = 0.0
+                    
+                    serialized_data = self._serialize_datetime(lead_data)
+                    doc_ref = self._get_collection('leads').document(lead_id)
+                    batch.set(doc_ref, serialized_data)
+                    lead_ids.append(lead_id)
+                batch.commit()
             
-            for lead_data in leads_data:
-                lead_id = f"lead_{int(time.time() * 1000)}_{len(lead_ids)}"
-                lead_data['lead_id'] = lead_id
-                lead_data['created_at'] = datetime.utcnow()
-                lead_data['status'] = 'new'
-                lead_data['lead_score'] = 0.0
-                
-                serialized_data = self._serialize_datetime(lead_data)
-                doc_ref = self._get_collection('leads').document(lead_id)
-                batch.set(doc_ref, serialized_data)
-                lead_ids.append(lead_id)
-            
-            batch.commit()
             logger.info(f"Bulk created {len(lead_ids)} leads successfully")
             return lead_ids
             
@@ -445,6 +466,34 @@ class DatabaseManager:
             logger.error(f"Failed to create email: {e}")
             raise
     
+    async def bulk_create_emails(self, emails_data: List[Dict[str, Any]]) -> List[str]:
+        """Create multiple email records in batched writes."""
+        try:
+            required_fields = ['email_id', 'campaign_id', 'lead_id', 'user_id', 'subject', 'body', 'email_type']
+            email_ids = []
+            
+            for start in range(0, len(emails_data), self.batch_size):
+                batch = self.db.batch()
+                for email_data in emails_data[start:start + self.batch_size]:
+                    if not self._validate_document(email_data, required_fields):
+                        raise ValueError("Missing required email fields")
+                    
+                    email_data['status'] = 'draft'
+                    email_data['metadata'] = email_data.get('metadata', {})
+                    
+                    serialized_data = self._serialize_datetime(email_data)
+                    doc_ref = self._get_collection('emails').document(email_data['email_id'])
+                    batch.set(doc_ref, serialized_data)
+                    email_ids.append(email_data['email_id'])
+                batch.commit()
+            
+            logger.info(f"Bulk created {len(email_ids)} emails successfully")
+            return email_ids
+            
+        except Exception as e:
+            logger.error(f"Failed to bulk create emails: {e}")
+            raise
+    
     async def update_email_status(self, email_id: str, status: str, timestamp_field: Optional[str] = None) -> bool:
         """Update email status and timestamp."""
         try:
@@ -503,6 +552,32 @@ class DatabaseManager:
             logger.error(f"Failed to get analytics for user {user_id}: {e}")
             raise
     
+    async def get_recent_activity(self, user_id: str, since: datetime) -> Dict[str, int]:
+        """Count emails sent and leads created for a user since a given time with server-side count aggregations."""
+        try:
+            since_iso = since.isoformat()
+            
+            # GmailAPI.send_email stores a 'manual' record for every email it sends; campaign and
+            # automation records are second copies of the same emails, so count only the former
+            emails_query = self._get_collection('emails').where('user_id', '==', user_id)
+            emails_query = emails_query.where('email_type', '==', 'manual')
+            emails_query = emails_query.where('sent_at', '>=', since_iso)
+            
+            leads_query = self._get_collection('leads').where('user_id', '==', user_id)
+            leads_query = leads_query.where('created_at', '>=', since_iso)
+            
+            activity = {
+                'emails_sent': int(emails_query.count().get()[0][0].value),
+                'leads_imported': int(leads_query.count().get()[0][0].value)
+            }
+            
+            logger.info(f"Retrieved recent activity for user {user_id}: {activity}")
+            return activity
+            
+        except Exception as e:
+            logger.error(f"Failed to get recent activity for user {user_id}: {e}")
+            raise
+    
     # Utility Methods
     async def health_check(self) -> bool:
         """Check database connectivity."""
@@ -16,8 +16,9 @@ import base64
 import email.mime.text
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import asyncio
+import threading
 from concurrent.futures import ThreadPoolExecutor
 import requests
 from googleapiclient.discovery import build
@@ -48,12 +49,8 @@ class LeadData:
     phone: Optional[str] = None
     linkedin_url: Optional[str] = None
     company_description: Optional[str] = None
-    pain_points: List[str] = None
+    pain_points: List[str] = field(default_factory=list)
     source: str = "google_sheets"
-    
-    def __post_init__(self):
-        if self.pain_points is None:
-            self.pain_points = []
 
 @dataclass
 class EmailResult:
@@ -106,6 +103,7 @@ class GoogleSheetsAPI:
         self.api_config = config.get_api_config()
         self.rate_limiter = RateLimiter(max_calls=100, time_window=60)  # 100 calls per minute
         self.service = None
+        self._service_token = None
         logger.info("Google Sheets API initialized")
     
     async def _get_authenticated_service(self):
@@ -116,6 +114,10 @@ class GoogleSheetsAPI:
             if not tokens:
                 raise ValueError("No Google Sheets OAuth tokens available")
             
+            # Reuse the built client (and its HTTP connections) while the token is unchanged
+            if self.service is not None and self._service_token == tokens.access_token:
+                return
+            
             credentials = Credentials(
                 token=tokens.access_token,
                 refresh_token=tokens.refresh_token,
@@ -139,6 +141,7 @@ class GoogleSheetsAPI:
                 )
             
             self.service = build('sheets', 'v4', credentials=credentials)
+            self._service_token = credentials.token
             logger.info("Google Sheets service authenticated successfully")
             
         except Exception as e:
@@ -147,54 +150,30 @@ class GoogleSheetsAPI:
     
     async def extract_leads_from_sheet(self, spreadsheet_id: str, range_name: str = "A:Z") -> List[LeadData]:
         """Extract lead data from Google Sheets."""
+        return await self.extract_leads_from_sheets(spreadsheet_id, [range_name])
+    
+    async def extract_leads_from_sheets(self, spreadsheet_id: str, ranges: List[str]) -> List[LeadData]:
+        """Extract lead data from several ranges (e.g. tabs) of a spreadsheet in one batchGet call."""
         try:
             await self.rate_limiter.wait_for_permission()
             
             if not self.service:
                 await self._get_authenticated_service()
             
-            # Get sheet data
-            result = self.service.spreadsheets().values().get(
+            # Fetch every range in a single round trip
+            result = self.service.spreadsheets().values().batchGet(
                 spreadsheetId=spreadsheet_id,
-                range=range_name
+                ranges=ranges,
+                majorDimension='ROWS'
             ).execute()
             
-            values = result.get('values', [])
-            if not values:
-                logger.warning("No data found in spreadsheet")
-                return []
-            
-            # Parse headers and data
-            headers = values[0]
-            data_rows = values[1:]
-            
             leads = []
-            for row in data_rows:
-                try:
-                    # Pad row to match header length
-                    padded_row = row + [''] * (len(headers) - len(row))
-                    
-                    # Create lead data
-                    lead_data = LeadData(
-                        name=padded_row[0] if len(padded_row) > 0 else '',
-                        email=padded_row[1] if len(padded_row) > 1 else '',
-                        company=padded_row[2] if len(padded_row) > 2 else '',
-                        job_title=padded_row[3] if len(padded_row) > 3 else '',
-                        phone=padded_row[4] if len(padded_row) > 4 else None,
-                        linkedin_url=padded_row[5] if len(padded_row) > 5 else None,
-                        company_description=padded_row[6] if len(padded_row) > 6 else None,
-                        pain_points=padded_row[7].split(',') if len(padded_row) > 7 and padded_row[7] else []
-                    )
-                    
-                    # Validate required fields
-                    if lead_data.name and lead_data.email and lead_data.company and lead_data.job_title:
-                        leads.append(lead_data)
-                    else:
-                        logger.warning(f"Skipping invalid lead data: {padded_row}")
-                        
-                except Exception as e:
-                    logger.error(f"Failed to parse row {row}: {e}")
+            for value_range in result.get('valueRanges', []):
+                values = value_range.get('values', [])
+                if not values:
+                    logger.warning(f"No data found in range {value_range.get('range')}")
                     continue
+                leads.extend(self._parse_lead_rows(values))
             
             logger.info(f"Successfully extracted {len(leads)} leads from spreadsheet")
             return leads
@@ -205,11 +184,47 @@ class GoogleSheetsAPI:
                 # Token expired, try to refresh
                 auth_mgr = get_auth_manager()
                 await auth_mgr.refresh_tokens()
-                return await self.extract_leads_from_sheet(spreadsheet_id, range_name)
+                return await self.extract_leads_from_sheets(spreadsheet_id, ranges)
             raise
         except Exception as e:
             logger.error(f"Failed to extract leads from spreadsheet: {e}")
             raise
+    
+    def _parse_lead_rows(self, values: List[List[str]]) -> List[LeadData]:
+        """Parse one range's rows (header row first) into lead data."""
+        # Parse headers and data
+        headers = values[0]
+        data_rows = values[1:]
+        
+        leads = []
+        for row in data_rows:
+            try:
+                # Pad row to match header length
+                padded_row = row + [''] * (len(headers) - len(row))
+                
+                # Create lead data
+                lead_data = LeadData(
+                    name=padded_row[0] if len(padded_row) > 0 else '',
+                    email=padded_row[1] if len(padded_row) > 1 else '',
+                    company=padded_row[2] if len(padded_row) > 2 else '',
+                    job_title=padded_row[3] if len(padded_row) > 3 else '',
+                    phone=padded_row[4] if len(padded_row) > 4 else None,
+                    linkedin_url=padded_row[5] if len(padded_row) > 5 else None,
+                    company_description=padded_row[6] if len(padded_row) > 6 else None,
+                    pain_points=padded_row[7].split(',') if len(padded_row) > 7 and padded_row[7] else []
+                )
+                
+                # Validate required fields
+                if lead_data.name and lead_data.email and lead_data.company and lead_data.job_title:
+                    leads.append(lead_data)
+                else:
+                    logger.warning(f"Skipping invalid lead data: {padded_row}")
+                    
+            except Exception as e:
+                logger.error(f"Failed to parse row {row}: {e}")
+                continue
+        
+        return leads
 
 class GmailAPI:
     """Gmail API integration for email sending and management."""
@@ -218,6 +233,10 @@ class GmailAPI:
         self.api_config = config.get_api_config()
         self.rate_limiter = RateLimiter(max_calls=100, time_window=60)  # 100 calls per minute
         self.service = None
+        self._service_token = None
+        self._credentials = None
+        # Per-thread clients for sends run off the event loop (httplib2 is not thread-safe)
+        self._send_clients = threading.local()
         self.max_emails_per_day = config.get_email_config().max_emails_per_day
         self.emails_sent_today = 0
         self.last_reset_date = datetime.now().date()
@@ -231,6 +250,10 @@ class GmailAPI:
             if not tokens:
                 raise ValueError("No Gmail OAuth tokens available")
             
+            # Reuse the built client (and its HTTP connections) while the token is unchanged
+            if self.service is not None and self._service_token == tokens.access_token:
+                return
+            
             credentials = Credentials(
                 token=tokens.access_token,
                 refresh_token=tokens.refresh_token,
@@ -254,6 +277,8 @@ class GmailAPI:
                 )
             
             self.service = build('gmail', 'v1', credentials=credentials)
+            self._service_token = credentials.token
+            self._credentials = credentials
             logger.info("Gmail service authenticated successfully")
             
         except Exception as e:
@@ -272,6 +297,17 @@ class GmailAPI:
         self._reset_daily_counter()
         return self.emails_sent_today < self.max_emails_per_day
     
+    def _send_raw_message(self, raw_message: str) -> Dict[str, Any]:
+        """Send an encoded message with this thread's own Gmail client."""
+        clients = self._send_clients
+        if getattr(clients, 'token', None) != self._service_token:
+            clients.service = build('gmail', 'v1', credentials=self._credentials)
+            clients.token = self._service_token
+        return clients.service.users().messages().send(
+            userId='me',
+            body={'raw': raw_message}
+        ).execute()
+    
     async def send_email(self, to_email: str, subject: str, body: str, 
                         from_name: str = None, reply_to: str = None) -> EmailResult:
         """Send email using Gmail API."""
@@ -304,11 +340,8 @@ class GmailAPI:
             # Encode message
             raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
             
-            # Send email
-            sent_message = self.service.users().messages().send(
-                userId='me',
-                body={'raw': raw_message}
-            ).execute()
+            # Send email in a worker thread so concurrent sends overlap
+            sent_message = await asyncio.to_thread(self._send_raw_message, raw_message)
             
             # Update counters
             self.emails_sent_today += 1
@@ -409,8 +442,9 @@ class GeminiAPI:
                 context_str = "\n".join([f"{k}: {v}" for k, v in context.items()])
                 enhanced_prompt = f"{prompt}\n\nContext:\n{context_str}"
             
-            # Generate content
-            response = self.model.generate_content(
+            # Generate content in a worker thread so concurrent requests overlap
+            response = await asyncio.to_thread(
+                self.model.generate_content,
                 enhanced_prompt,
                 generation_config=genai.types.GenerationConfig(
                     max_output_tokens=self.max_tokens,